@@ -1,33 +1,60 @@
 import calendar
+import functools
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
-from collections import defaultdict, Counter
-import math
+
+import numpy as np
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday",
+                 "Friday", "Saturday", "Sunday")
+
+@functools.lru_cache(maxsize=16)
+def _days_in_month(year: int, month: int) -> int:
+    """Days in the given month (monthrange does pure-Python table work)"""
+    return calendar.monthrange(year, month)[1]
+
+def _memoized(method):
+    """Cache a no-arg method's result until the data or the calendar day changes"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        key = (self.data_manager.data_version(), datetime.now().toordinal())
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        result = method(self)
+        self._memo[name] = (key, result)
+        return result
+
+    return wrapper
 
 class AnalyticsEngine:
     def __init__(self, data_manager):
         self.data_manager = data_manager
-    
+        self._memo = {}
+
+    @_memoized
     def get_monthly_progress_stats(self) -> Dict[str, Any]:
         """Calculate monthly progress statistics"""
         today = datetime.now()
         month_start = today.replace(day=1)
-        month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
-        
-        start_str = month_start.strftime("%Y-%m-%d")
-        end_str = month_end.strftime("%Y-%m-%d")
-        
-        entries = self.data_manager.get_entries_in_date_range(start_str, end_str)
+        month_end = today.replace(day=_days_in_month(today.year, today.month))
+
         settings = self.data_manager.get_settings()
         monthly_target = settings.get('monthly_target', 30)
-        
-        # Calculate stats
-        total_entries = len(entries)
-        total_progress = sum(entry['progress'] for entry in entries)
+
+        # Vectorized reduction over the month's contiguous slice
+        _, progress, _, _ = self.data_manager.get_column_data()
+        lo, hi = self.data_manager.get_range_bounds(
+            month_start.strftime("%Y-%m-%d"), month_end.strftime("%Y-%m-%d"))
+        total_entries = hi - lo
+        total_progress = int(progress[lo:hi].sum())
         avg_progress = total_progress / total_entries if total_entries > 0 else 0
         
         # Days in month and current day
-        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        days_in_month = _days_in_month(today.year, today.month)
         current_day = today.day
         
         # Calculate expected progress
@@ -55,19 +82,23 @@ class AnalyticsEngine:
         
         start_str = month_start.strftime("%Y-%m-%d")
         today_str = today.strftime("%Y-%m-%d")
-        
-        entries = self.data_manager.get_entries_in_date_range(start_str, today_str)
+
+        lo, hi = self.data_manager.get_range_bounds(start_str, today_str)
         settings = self.data_manager.get_settings()
         monthly_target = settings.get('monthly_target', 30)
-        
+
         # Calculate expected vs actual
-        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        days_in_month = _days_in_month(today.year, today.month)
         expected_daily_target = monthly_target / days_in_month
         expected_by_today = expected_daily_target * today.day
-        actual_entries = len(entries)
+        actual_entries = hi - lo
         
-        days_behind = max(0, math.ceil(expected_by_today - actual_entries))
-        days_ahead = max(0, math.ceil(actual_entries - expected_by_today))
+        # ceil(a/b) == -(-a // b) for positive b: exact integer arithmetic
+        # with no float round-trip near the schedule boundary
+        expected_numerator = monthly_target * today.day
+        actual_numerator = actual_entries * days_in_month
+        days_behind = max(0, -((actual_numerator - expected_numerator) // days_in_month))
+        days_ahead = max(0, -((expected_numerator - actual_numerator) // days_in_month))
         
         # Status classification
         if days_behind > 2:
@@ -92,79 +123,92 @@ class AnalyticsEngine:
             'actual_entries': actual_entries
         }
     
+    @_memoized
     def get_weekly_trends(self) -> Dict[str, Any]:
         """Analyze weekly trends"""
         today = datetime.now()
-        week_start = today - timedelta(days=today.weekday())
-        
+        week_start = (today - timedelta(days=today.weekday())).date()
+        window_start = week_start - timedelta(weeks=3)
+        window_end = week_start + timedelta(days=6)
+
+        # Bucket the 4-week window's contiguous slice by week in one bincount
+        lo, hi = self.data_manager.get_range_bounds(
+            window_start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+        date_ord, progress, _, _ = self.data_manager.get_column_data()
+        week_codes = (date_ord[lo:hi] - window_start.toordinal()) // 7
+        counts = np.bincount(week_codes, minlength=4)
+        progress_sums = np.bincount(week_codes, weights=progress[lo:hi], minlength=4)
+
         weekly_data = []
-        for i in range(4):  # Last 4 weeks
+        for i in range(4):  # Last 4 weeks, most recent first
             start = week_start - timedelta(weeks=i)
             end = start + timedelta(days=6)
-            
-            start_str = start.strftime("%Y-%m-%d")
-            end_str = end.strftime("%Y-%m-%d")
-            
-            entries = self.data_manager.get_entries_in_date_range(start_str, end_str)
-            
+            week_idx = 3 - i
+
             weekly_data.append({
                 'week': f"Week {4-i}",
-                'entries': len(entries),
-                'avg_progress': sum(entry['progress'] for entry in entries) / len(entries) if entries else 0,
-                'start_date': start_str,
-                'end_date': end_str
+                'entries': int(counts[week_idx]),
+                'avg_progress': float(progress_sums[week_idx]) / int(counts[week_idx]) if counts[week_idx] else 0,
+                'start_date': start.strftime("%Y-%m-%d"),
+                'end_date': end.strftime("%Y-%m-%d")
             })
-        
+
         return {'weekly_data': weekly_data}
     
+    @_memoized
     def get_mood_analysis(self) -> Dict[str, Any]:
         """Analyze mood patterns"""
-        entries = self.data_manager.get_all_entries()
-        
-        mood_counts = Counter(entry['feeling'] for entry in entries if entry['feeling'])
-        mood_progress = defaultdict(list)
-        
-        for entry in entries:
-            if entry['feeling']:
-                mood_progress[entry['feeling']].append(entry['progress'])
-        
+        _, progress, feeling_code, vocab = self.data_manager.get_column_data()
+
+        # Count and sum progress per mood with two bincounts (codes < 0 mean
+        # an empty feeling and are skipped)
+        valid = feeling_code >= 0
+        codes = feeling_code[valid].astype(np.int64)
+        counts = np.bincount(codes, minlength=len(vocab))
+        progress_sums = np.bincount(codes, weights=progress[valid], minlength=len(vocab))
+
+        mood_counts = {}
         mood_stats = {}
-        for mood, progress_list in mood_progress.items():
-            if progress_list:
-                mood_stats[mood] = {
-                    'count': len(progress_list),
-                    'avg_progress': sum(progress_list) / len(progress_list),
-                    'total_progress': sum(progress_list)
-                }
-        
+        for code, mood in enumerate(vocab):
+            count = int(counts[code])
+            if count == 0:
+                continue
+            progress_sum = int(progress_sums[code])
+            mood_counts[mood] = count
+            mood_stats[mood] = {
+                'count': count,
+                'avg_progress': progress_sum / count,
+                'total_progress': progress_sum
+            }
+
         return {
-            'mood_counts': dict(mood_counts),
+            'mood_counts': mood_counts,
             'mood_stats': mood_stats,
-            'total_entries': len(entries)
+            'total_entries': int(feeling_code.size)
         }
     
+    @_memoized
     def get_productivity_patterns(self) -> Dict[str, Any]:
         """Analyze productivity patterns"""
-        entries = self.data_manager.get_all_entries()
-        
-        # Group by day of week
-        weekday_data = defaultdict(list)
-        for entry in entries:
-            try:
-                date_obj = datetime.strptime(entry['date'], "%Y-%m-%d")
-                weekday = date_obj.strftime("%A")
-                weekday_data[weekday].append(entry['progress'])
-            except ValueError:
-                continue
-        
+        date_ord, progress, _, _ = self.data_manager.get_column_data()
+
+        # Day-of-week falls out of the ordinal directly (Monday == 0), so the
+        # whole aggregation is two bincounts over valid dates
+        valid = date_ord > 0
+        weekday_codes = (date_ord[valid] + 6) % 7
+        counts = np.bincount(weekday_codes, minlength=7)
+        progress_sums = np.bincount(weekday_codes, weights=progress[valid], minlength=7)
+
         weekday_stats = {}
-        for day, progress_list in weekday_data.items():
-            if progress_list:
-                weekday_stats[day] = {
-                    'count': len(progress_list),
-                    'avg_progress': sum(progress_list) / len(progress_list),
-                    'total_entries': len(progress_list)
-                }
+        for code, day in enumerate(WEEKDAY_NAMES):
+            count = int(counts[code])
+            if count == 0:
+                continue
+            weekday_stats[day] = {
+                'count': count,
+                'avg_progress': float(progress_sums[code]) / count,
+                'total_entries': count
+            }
         
         # Find most productive days
         sorted_days = sorted(weekday_stats.items(), 
@@ -182,7 +226,7 @@ class AnalyticsEngine:
         
         # Current month
         current_month_start = today.replace(day=1)
-        current_month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        current_month_end = today.replace(day=_days_in_month(today.year, today.month))
         
         # Previous month
         if today.month == 1:
@@ -190,31 +234,24 @@ class AnalyticsEngine:
         else:
             prev_month = today.replace(month=today.month-1, day=1)
         
-        prev_month_end = prev_month.replace(day=calendar.monthrange(prev_month.year, prev_month.month)[1])
-        
-        # Get entries
-        current_entries = self.data_manager.get_entries_in_date_range(
-            current_month_start.strftime("%Y-%m-%d"),
-            current_month_end.strftime("%Y-%m-%d")
-        )
-        
-        prev_entries = self.data_manager.get_entries_in_date_range(
-            prev_month.strftime("%Y-%m-%d"),
-            prev_month_end.strftime("%Y-%m-%d")
-        )
-        
-        # Calculate stats
-        current_stats = {
-            'total_entries': len(current_entries),
-            'avg_progress': sum(entry['progress'] for entry in current_entries) / len(current_entries) if current_entries else 0,
-            'total_progress': sum(entry['progress'] for entry in current_entries)
-        }
+        prev_month_end = prev_month.replace(day=_days_in_month(prev_month.year, prev_month.month))
         
-        prev_stats = {
-            'total_entries': len(prev_entries),
-            'avg_progress': sum(entry['progress'] for entry in prev_entries) / len(prev_entries) if prev_entries else 0,
-            'total_progress': sum(entry['progress'] for entry in prev_entries)
-        }
+        # Reduce each month's contiguous column slice
+        _, progress, _, _ = self.data_manager.get_column_data()
+
+        def slice_stats(start, end):
+            lo, hi = self.data_manager.get_range_bounds(
+                start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+            total_entries = hi - lo
+            total_progress = int(progress[lo:hi].sum())
+            return {
+                'total_entries': total_entries,
+                'avg_progress': total_progress / total_entries if total_entries else 0,
+                'total_progress': total_progress
+            }
+
+        current_stats = slice_stats(current_month_start, current_month_end)
+        prev_stats = slice_stats(prev_month, prev_month_end)
         
         # Calculate changes
         entry_change = current_stats['total_entries'] - prev_stats['total_entries']
@@ -229,37 +266,35 @@ class AnalyticsEngine:
             'prev_month_name': prev_month.strftime("%B %Y")
         }
     
+    @_memoized
     def get_monthly_progress_chart_data(self) -> Dict[str, Any]:
         """Get data for monthly progress chart"""
         today = datetime.now()
-        month_start = today.replace(day=1)
-        
-        # Get daily data for current month
-        daily_data = []
-        labels = []
-        
-        for day in range(1, today.day + 1):
-            date = month_start.replace(day=day)
-            date_str = date.strftime("%Y-%m-%d")
-            entries = self.data_manager.get_entries_by_date(date_str)
-            
-            daily_data.append(len(entries))
-            labels.append(str(day))
-        
+        month_start_ord = today.replace(day=1).toordinal()
+
+        # One bincount over the month's day offsets, then a cumulative sum,
+        # instead of a per-day lookup plus per-day prefix sums
+        date_ord, _, _, _ = self.data_manager.get_column_data()
+        day_offsets = date_ord - month_start_ord
+        in_month = (day_offsets >= 0) & (day_offsets < today.day)
+        daily_counts = np.bincount(day_offsets[in_month], minlength=today.day)
+
+        labels = [str(day) for day in range(1, today.day + 1)]
+
         # Calculate target line
         settings = self.data_manager.get_settings()
         monthly_target = settings.get('monthly_target', 30)
-        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        days_in_month = _days_in_month(today.year, today.month)
         daily_target = monthly_target / days_in_month
-        
-        target_line = [daily_target * (i + 1) for i in range(len(daily_data))]
-        
+
+        target_line = (daily_target * np.arange(1, today.day + 1)).tolist()
+
         return {
             'labels': labels,
             'datasets': [
                 {
                     'label': '実際の進捗',
-                    'data': [sum(daily_data[:i+1]) for i in range(len(daily_data))],
+                    'data': np.cumsum(daily_counts).astype(int).tolist(),
                     'borderColor': 'rgb(54, 162, 235)',
                     'backgroundColor': 'rgba(54, 162, 235, 0.2)',
                     'tension': 0.1
@@ -1,6 +1,7 @@
 import os
 import logging
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask_caching import Cache
 from datetime import datetime, timedelta
 import json
 from models import IncomeGoalManager
@@ -12,10 +13,14 @@ logging.basicConfig(level=logging.DEBUG)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "default_secret_key_for_development")
 
+# In-process response cache for the read-only pages; write routes clear it
+cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+
 # Initialize income goal manager
 goal_manager = IncomeGoalManager()
 
 @app.route("/")
+@cache.cached(timeout=60)
 def index():
     today = datetime.now()
     today_str = today.strftime("%Y-%m-%d")
@@ -56,14 +61,17 @@ def add_log():
         
         if not task_description:
             flash("タスク内容を入力してください。", "error")
+            cache.clear()
             return redirect(url_for("index"))
-        
+
         if units_completed < 0:
             flash("完了数は0以上で入力してください。", "error")
+            cache.clear()
             return redirect(url_for("index"))
-        
+
         if progress_percent < 0 or progress_percent > 100:
             flash("進捗は0-100の範囲で入力してください。", "error")
+            cache.clear()
             return redirect(url_for("index"))
         
         # Add daily log
@@ -80,7 +88,8 @@ def add_log():
     except Exception as e:
         logging.error(f"Error adding log: {e}")
         flash("エラーが発生しました。", "error")
-    
+
+    cache.clear()
     return redirect(url_for("index"))
 
 @app.route("/income_sources")
@@ -102,10 +111,12 @@ def add_income_source():
         
         if not name:
             flash("収入源名を入力してください。", "error")
+            cache.clear()
             return redirect(url_for("income_sources"))
-        
+
         if unit_price <= 0 or monthly_target <= 0:
             flash("単価と月間目標は正の数で入力してください。", "error")
+            cache.clear()
             return redirect(url_for("income_sources"))
         
         success = goal_manager.add_income_source(name, unit_price, monthly_target, description)
@@ -120,10 +131,12 @@ def add_income_source():
     except Exception as e:
         logging.error(f"Error adding income source: {e}")
         flash("エラーが発生しました。", "error")
-    
+
+    cache.clear()
     return redirect(url_for("income_sources"))
 
 @app.route("/analytics")
+@cache.cached(timeout=60)
 def analytics_page():
     monthly_progress = goal_manager.get_monthly_progress()
     ai_suggestions = goal_manager.get_ai_suggestions()
@@ -149,13 +162,15 @@ def settings():
         except Exception as e:
             logging.error(f"Error updating settings: {e}")
             flash("設定の更新に失敗しました。", "error")
-        
+
+        cache.clear()
         return redirect(url_for("settings"))
     
     current_settings = goal_manager.get_settings()
     return render_template("settings.html", settings=current_settings)
 
 @app.route("/api/chart_data")
+@cache.cached(timeout=60, query_string=True)
 def chart_data():
     """API endpoint for chart data"""
     chart_type = request.args.get("type", "income_progress")
@@ -208,8 +223,10 @@ def delete_income_source(source_id):
     except Exception as e:
         logging.error(f"Error deleting income source: {e}")
         flash("エラーが発生しました。", "error")
-    
+
+    cache.clear()
     return redirect(url_for("income_sources"))
 
 if __name__ == "__main__":
+    # Development fallback only; use start-backend.sh (gunicorn) in production
     app.run(host='0.0.0.0', port=5000, debug=True)
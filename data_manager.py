@@ -1,13 +1,51 @@
 import csv
+import functools
 import os
 import json
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+def _atomic_write_json(path: str, obj: Any):
+    """Write JSON to a temp file, fsync, then atomically replace the target"""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+@functools.lru_cache(maxsize=1024)
+def _date_to_ordinal(date_str: str) -> int:
+    """Convert a YYYY-MM-DD string to a proleptic Gregorian ordinal (0 if invalid)"""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return 0
+
 class DataManager:
     def __init__(self):
         self.log_file = "goal_tracking.csv"
         self.settings_file = "settings.json"
+        self.deleted_file = "deleted_ids.json"
+        self.deleted_ids = set()
+        self._cache = None
+        self._cache_mtime = None
+        self._settings_cache = None
+        self._settings_mtime = None
+        self._by_date = {}
+        self._max_id = 0
+        self.col_progress = np.empty(0, dtype=np.int32)
+        self.col_date_ord = np.empty(0, dtype=np.int32)
+        self.col_feeling_code = np.empty(0, dtype=np.int8)
+        self.feeling_vocab = []
         self.init_files()
     
     def init_files(self):
@@ -24,27 +62,164 @@ class DataManager:
                 "monthly_target": 30,
                 "created_at": datetime.now().isoformat()
             }
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(default_settings, f, ensure_ascii=False, indent=2)
-    
-    def get_next_id(self) -> int:
-        """Get the next available ID"""
-        if not os.path.exists(self.log_file):
-            return 1
-        
+            _atomic_write_json(self.settings_file, default_settings)
+
+        # Tombstoned entry ids from lazy deletes
+        if os.path.exists(self.deleted_file):
+            try:
+                with open(self.deleted_file, "r", encoding="utf-8") as f:
+                    self.deleted_ids = set(json.load(f))
+            except Exception as e:
+                print(f"Error reading deleted ids: {e}")
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """Load and cache all entries, re-parsing only when the file changes"""
         try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                max_id = 0
-                for row in reader:
-                    try:
-                        current_id = int(row['id'])
-                        max_id = max(max_id, current_id)
-                    except (ValueError, KeyError):
+            mtime = os.stat(self.log_file).st_mtime_ns
+        except OSError:
+            return []
+
+        if self._cache is not None and self._cache_mtime == mtime:
+            return self._cache
+
+        try:
+            if pd is not None:
+                entries, max_id = self._parse_log_pandas()
+            else:
+                entries, max_id = self._parse_log_stdlib()
+        except Exception as e:
+            print(f"Error reading all entries: {e}")
+            return []
+
+        # Secondary index: date -> entries for exact-date lookups
+        by_date = defaultdict(list)
+        for entry in entries:
+            by_date[entry['date']].append(entry)
+
+        # Keep entries (and therefore the columns below) sorted by date so
+        # range queries are a binary search plus a contiguous slice
+        entries.sort(key=lambda e: _date_to_ordinal(e['date']))
+
+        # Column-oriented (SoA) views: NumPy reductions over these replace
+        # Python-level loops over the list of dicts
+        count = len(entries)
+        self.feeling_vocab = sorted({e['feeling'] for e in entries if e['feeling']})
+        feeling_codes = {feeling: code for code, feeling in enumerate(self.feeling_vocab)}
+        self.col_progress = np.fromiter(
+            (e['progress'] for e in entries), dtype=np.int32, count=count)
+        self.col_date_ord = np.fromiter(
+            (_date_to_ordinal(e['date']) for e in entries), dtype=np.int32, count=count)
+        self.col_feeling_code = np.fromiter(
+            (feeling_codes.get(e['feeling'], -1) for e in entries), dtype=np.int8, count=count)
+
+        self._by_date = dict(by_date)
+        self._max_id = max_id
+        self._cache = entries
+        self._cache_mtime = mtime
+        return entries
+
+    def _parse_log_pandas(self) -> tuple:
+        """Parse the log with pandas' C tokenizer; returns (entries, max_id)"""
+        df = pd.read_csv(self.log_file, dtype="string", keep_default_na=False)
+
+        # Coerce numeric columns in bulk, dropping malformed rows like the
+        # stdlib path does
+        ids = pd.to_numeric(df['id'], errors='coerce')
+        progress = pd.to_numeric(df['progress'], errors='coerce')
+        valid = ids.notna() & progress.notna()
+
+        ids = ids[valid].astype('int64')
+        max_id = max(max(self.deleted_ids, default=0),
+                     int(ids.max()) if len(ids) else 0)
+
+        live = ~ids.isin(list(self.deleted_ids)) if self.deleted_ids else slice(None)
+        df = df[valid][live]
+
+        entries = [
+            {'id': entry_id, 'date': date, 'title': title, 'progress': prog,
+             'feeling': feeling, 'reason': reason, 'created_at': created_at}
+            for entry_id, date, title, prog, feeling, reason, created_at in zip(
+                ids[live].tolist(), df['date'].tolist(), df['title'].tolist(),
+                progress[valid][live].astype('int64').tolist(), df['feeling'].tolist(),
+                df['reason'].tolist(), df['created_at'].tolist())
+        ]
+        return entries, max_id
+
+    def _parse_log_stdlib(self) -> tuple:
+        """Parse the log with the stdlib csv module; returns (entries, max_id)"""
+        entries = []
+        max_id = max(self.deleted_ids, default=0)
+        with open(self.log_file, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # header row
+            for row in reader:
+                try:
+                    # Positional unpack: no per-row dict with string keys
+                    raw_id, date, title, raw_progress, feeling, reason, created_at = row
+                    entry_id = int(raw_id)
+                    max_id = max(max_id, entry_id)
+                    if entry_id in self.deleted_ids:
                         continue
-                return max_id + 1
-        except Exception:
-            return 1
+                    entries.append({
+                        'id': entry_id,
+                        'date': date,
+                        'title': title,
+                        'progress': int(raw_progress),
+                        'feeling': feeling,
+                        'reason': reason,
+                        'created_at': created_at
+                    })
+                except ValueError as e:
+                    print(f"Error parsing entry: {e}")
+                    continue
+        return entries, max_id
+
+    def get_column_data(self) -> tuple:
+        """Get the (date_ordinal, progress, feeling_code, feeling_vocab) columns"""
+        self._load()
+        return self.col_date_ord, self.col_progress, self.col_feeling_code, self.feeling_vocab
+
+    def data_version(self) -> tuple:
+        """Opaque token that changes whenever the log or settings files change"""
+        self._load()
+        try:
+            settings_mtime = os.stat(self.settings_file).st_mtime_ns
+        except OSError:
+            settings_mtime = None
+        return self._cache_mtime, settings_mtime
+
+    def _invalidate_cache(self):
+        """Force the next read to re-parse the log file"""
+        self._cache = None
+        self._cache_mtime = None
+
+    def _cache_append(self, entry: Dict[str, Any]):
+        """Fold one appended entry into the cache instead of invalidating it"""
+        if self._cache is None:
+            return
+
+        self._cache.append(entry)
+        self._max_id = max(self._max_id, entry['id'])
+        date_str = entry['date']
+        self._by_date.setdefault(date_str, []).append(entry)
+
+        feeling = entry['feeling']
+        if feeling and feeling not in self.feeling_vocab:
+            self.feeling_vocab.append(feeling)
+        code = self.feeling_vocab.index(feeling) if feeling else -1
+        self.col_progress = np.append(self.col_progress, np.int32(entry['progress']))
+        self.col_date_ord = np.append(self.col_date_ord, np.int32(_date_to_ordinal(date_str)))
+        self.col_feeling_code = np.append(self.col_feeling_code, np.int8(code))
+
+        try:
+            self._cache_mtime = os.stat(self.log_file).st_mtime_ns
+        except OSError:
+            self._invalidate_cache()
+
+    def get_next_id(self) -> int:
+        """Get the next available ID"""
+        self._load()
+        return self._max_id + 1
     
     def add_entry(self, title: str, progress: int, feeling: str, reason: str) -> bool:
         """Add a new goal tracking entry"""
@@ -56,7 +231,16 @@ class DataManager:
             with open(self.log_file, "a", encoding="utf-8", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow([entry_id, today, title, progress, feeling, reason, created_at])
-            
+
+            self._cache_append({
+                'id': entry_id,
+                'date': today,
+                'title': title,
+                'progress': progress,
+                'feeling': feeling,
+                'reason': reason,
+                'created_at': created_at
+            })
             return True
         except Exception as e:
             print(f"Error adding entry: {e}")
@@ -64,89 +248,67 @@ class DataManager:
     
     def get_entries_by_date(self, date_str: str) -> List[Dict[str, Any]]:
         """Get all entries for a specific date"""
-        entries = []
-        
-        if not os.path.exists(self.log_file):
-            return entries
-        
-        try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['date'] == date_str:
-                        entry = {
-                            'id': int(row['id']),
-                            'date': row['date'],
-                            'title': row['title'],
-                            'progress': int(row['progress']),
-                            'feeling': row['feeling'],
-                            'reason': row['reason'],
-                            'created_at': row.get('created_at', '')
-                        }
-                        entries.append(entry)
-        except Exception as e:
-            print(f"Error reading entries: {e}")
-        
-        return entries
-    
+        self._load()
+        return self._by_date.get(date_str, [])
+
     def get_all_entries(self) -> List[Dict[str, Any]]:
         """Get all entries"""
-        entries = []
-        
-        if not os.path.exists(self.log_file):
-            return entries
-        
-        try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        entry = {
-                            'id': int(row['id']),
-                            'date': row['date'],
-                            'title': row['title'],
-                            'progress': int(row['progress']),
-                            'feeling': row['feeling'],
-                            'reason': row['reason'],
-                            'created_at': row.get('created_at', '')
-                        }
-                        entries.append(entry)
-                    except (ValueError, KeyError) as e:
-                        print(f"Error parsing entry: {e}")
-                        continue
-        except Exception as e:
-            print(f"Error reading all entries: {e}")
-        
-        return entries
+        return self._load()
     
     def delete_entry(self, entry_id: int) -> bool:
-        """Delete an entry by ID"""
+        """Delete an entry by ID (tombstone; the file is compacted lazily)"""
         try:
-            entries = self.get_all_entries()
-            filtered_entries = [entry for entry in entries if entry['id'] != entry_id]
-            
-            # Rewrite the file
-            with open(self.log_file, "w", encoding="utf-8", newline="") as f:
+            self.deleted_ids.add(entry_id)
+            _atomic_write_json(self.deleted_file, sorted(self.deleted_ids))
+
+            self._invalidate_cache()
+            self._maybe_compact()
+            return True
+        except Exception as e:
+            print(f"Error deleting entry: {e}")
+            return False
+
+    def _maybe_compact(self):
+        """Rewrite the log without tombstoned rows once they exceed 25% of the file"""
+        entries = self._load()
+        total = len(entries) + len(self.deleted_ids)
+        if total == 0 or len(self.deleted_ids) / total <= 0.25:
+            return
+
+        try:
+            tmp = self.log_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
                 writer = csv.writer(f)
                 writer.writerow(["id", "date", "title", "progress", "feeling", "reason", "created_at"])
-                
-                for entry in filtered_entries:
+
+                for entry in entries:
                     writer.writerow([
-                        entry['id'], entry['date'], entry['title'], 
-                        entry['progress'], entry['feeling'], entry['reason'], 
+                        entry['id'], entry['date'], entry['title'],
+                        entry['progress'], entry['feeling'], entry['reason'],
                         entry['created_at']
                     ])
-            
-            return True
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.log_file)
+
+            self.deleted_ids = set()
+            if os.path.exists(self.deleted_file):
+                os.remove(self.deleted_file)
+            self._invalidate_cache()
         except Exception as e:
-            print(f"Error deleting entry: {e}")
-            return False
+            print(f"Error compacting log file: {e}")
     
     def get_settings(self) -> Dict[str, Any]:
         """Get application settings"""
         try:
+            mtime = os.stat(self.settings_file).st_mtime_ns
+            if self._settings_cache is not None and self._settings_mtime == mtime:
+                return self._settings_cache
+
             with open(self.settings_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                self._settings_cache = json.load(f)
+            self._settings_mtime = mtime
+            return self._settings_cache
         except Exception as e:
             print(f"Error reading settings: {e}")
             return {"monthly_target": 30}
@@ -158,21 +320,24 @@ class DataManager:
             current_settings.update(new_settings)
             current_settings['updated_at'] = datetime.now().isoformat()
             
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(current_settings, f, ensure_ascii=False, indent=2)
-            
+            _atomic_write_json(self.settings_file, current_settings)
+
+            self._settings_cache = None
+            self._settings_mtime = None
             return True
         except Exception as e:
             print(f"Error updating settings: {e}")
             return False
     
+    def get_range_bounds(self, start_date: str, end_date: str) -> tuple:
+        """Get (lo, hi) slice bounds of the entries inside [start_date, end_date]"""
+        self._load()
+        bounds = np.searchsorted(
+            self.col_date_ord,
+            [_date_to_ordinal(start_date), _date_to_ordinal(end_date) + 1])
+        return int(bounds[0]), int(bounds[1])
+
     def get_entries_in_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Get entries within a date range"""
-        entries = self.get_all_entries()
-        filtered_entries = []
-        
-        for entry in entries:
-            if start_date <= entry['date'] <= end_date:
-                filtered_entries.append(entry)
-        
-        return filtered_entries
+        lo, hi = self.get_range_bounds(start_date, end_date)
+        return self._cache[lo:hi] if self._cache else []
@@ -1,11 +1,18 @@
 import os
+import calendar
 import logging
-from flask import Flask, request, jsonify, send_from_directory
+import queue
+import threading
+from contextlib import contextmanager
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 from datetime import datetime, timedelta
 import sqlite3
 import json
 from typing import Dict, List, Any, Optional
+from cachetools import TTLCache
+import orjson
+from pydantic import BaseModel, Field, ValidationError
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -18,23 +25,187 @@ app.secret_key = os.environ.get("SESSION_SECRET", "default_secret_key_for_develo
 # Database configuration
 DATABASE_PATH = "income_tracker.db"
 
+# Short-TTL cache for the dashboard/analytics aggregations; every write
+# endpoint clears it, the TTL only bounds staleness across workers.
+# TTLCache mutates internal state even on lookups (expiry), and gthread
+# workers serve requests from several threads, so all access is locked
+DASHBOARD_CACHE = TTLCache(maxsize=64, ttl=30)
+DASHBOARD_CACHE_LOCK = threading.Lock()
+
+# Demo rows inserted into a fresh database
+SEED_ROWS = [
+    ('FANZA出版', 'Fixed Unit', 30000, 100, 'デジタル出版による収入'),
+    ('フリーライティング', 'Fixed Unit', 50000, 5000, 'ライティング案件'),
+    ('Uber Eats', 'Daily Input', 25000, None, '配達による日次収入'),
+]
+
+class IncomeSourceIn(BaseModel):
+    """Request body for creating an income source"""
+    name: str = Field(min_length=1)
+    type: str
+    goal_amount: float = Field(gt=0)
+    unit_price: Optional[float] = None
+    description: str = ""
+
+class IncomeSourceUpdate(BaseModel):
+    """Request body for updating an income source; goal_amount keeps its old value when omitted"""
+    name: str = Field(min_length=1)
+    type: str
+    goal_amount: Optional[float] = Field(default=None, gt=0)
+    unit_price: Optional[float] = None
+    description: str = ""
+
+class DailyLogIn(BaseModel):
+    """Request body for creating or updating a daily log"""
+    income_id: int
+    date: str = Field(min_length=1)
+    task_name: str = Field(min_length=1)
+    task_count: Optional[int] = None
+    amount: Optional[float] = None
+    progress_percent: int = 0
+    mood_score: int = 3
+    note: str = ""
+
+def _validation_message(error: ValidationError) -> str:
+    """Flatten the first pydantic error into the API's single-string format"""
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"]) or "body"
+    return f"{field}: {first['msg']}"
+
+# Hot-path SQL as module-level constants: a single interned str object
+# per statement keeps sqlite3's per-connection statement cache hitting
+SQL_GET_SOURCES = "SELECT * FROM income_sources ORDER BY created_at DESC"
+SQL_INSERT_DAILY_LOG = """
+    INSERT INTO daily_logs
+    (income_id, date, task_name, task_count, amount, progress_percent, mood_score, note)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# The per-source amount rule, evaluated inside the write statement so a
+# single round-trip replaces the old SELECT-then-write pair
+_SQL_AMOUNT_CASE = """
+    CASE WHEN s.type = 'Fixed Unit' AND s.unit_price IS NOT NULL AND ? IS NOT NULL
+         THEN s.unit_price * ?
+         WHEN s.type IN ('Daily Input', 'Passive') THEN COALESCE(?, 0)
+         ELSE 0
+    END
+"""
+SQL_CREATE_DAILY_LOG = f"""
+    INSERT INTO daily_logs
+    (income_id, date, task_name, task_count, amount, progress_percent, mood_score, note)
+    SELECT s.id, ?, ?, ?, {_SQL_AMOUNT_CASE}, ?, ?, ?
+    FROM income_sources s WHERE s.id = ?
+"""
+SQL_UPDATE_DAILY_LOG = f"""
+    UPDATE daily_logs
+    SET income_id = ?, date = ?, task_name = ?, task_count = ?,
+        amount = (SELECT {_SQL_AMOUNT_CASE} FROM income_sources s WHERE s.id = ?),
+        progress_percent = ?, mood_score = ?, note = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND EXISTS (SELECT 1 FROM income_sources WHERE id = ?)
+"""
+SQL_DASHBOARD_SOURCES = """
+    SELECT s.*,
+           COALESCE(SUM(dl.amount), 0) as earned,
+           COUNT(dl.id) as task_count,
+           COALESCE(AVG(dl.mood_score), 3) as avg_mood
+    FROM income_sources s
+    LEFT JOIN daily_logs dl
+        ON dl.income_id = s.id AND dl.date >= ? AND dl.date < ?
+    GROUP BY s.id
+    ORDER BY s.created_at DESC
+"""
+
+# The four filter combinations of the daily-logs listing, pre-built so
+# request handling never concatenates SQL
+_SQL_LOGS_BASE = """
+    SELECT dl.*, src.name as source_name
+    FROM daily_logs dl
+    LEFT JOIN income_sources src ON dl.income_id = src.id
+"""
+_SQL_LOGS_ORDER = " ORDER BY dl.date DESC, dl.created_at DESC"
+SQL_GET_LOGS = {
+    (False, False): _SQL_LOGS_BASE + _SQL_LOGS_ORDER,
+    (True, False): _SQL_LOGS_BASE + "WHERE dl.date = ?" + _SQL_LOGS_ORDER,
+    (False, True): _SQL_LOGS_BASE + "WHERE dl.income_id = ?" + _SQL_LOGS_ORDER,
+    (True, True): _SQL_LOGS_BASE + "WHERE dl.date = ? AND dl.income_id = ?" + _SQL_LOGS_ORDER,
+}
+
+def _iter_rows(cursor):
+    """Yield rows in fetchmany batches bounded by cursor.arraysize"""
+    while True:
+        batch = cursor.fetchmany()
+        if not batch:
+            return
+        yield from batch
+
+def json_response(payload):
+    """Serialize a response with orjson; sqlite3.Row rows convert lazily"""
+    return Response(orjson.dumps(payload, default=dict), mimetype="application/json")
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections
+
+    Opening a connection per request repays the file open and WAL setup
+    every time and throws away the per-connection page cache; pooled
+    connections keep that cache warm across requests.
+    """
+
+    def __init__(self, database: str, size: int = 8):
+        self.database = database
+        self._pool = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=512,
+        )
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-32000")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def acquire(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            # Row factories are per-request choices; don't leak them to
+            # the next checkout
+            conn.row_factory = None
+            self._pool.put(conn)
+
 class IncomeTracker:
     def __init__(self):
         self.init_database()
-    
+        self.pool = ConnectionPool(DATABASE_PATH)
+
     def init_database(self):
         """Initialize SQLite database with required tables"""
         conn = sqlite3.connect(DATABASE_PATH)
         cursor = conn.cursor()
-        
-        # Drop existing tables to recreate with new schema
-        cursor.execute("DROP TABLE IF EXISTS daily_logs")
-        cursor.execute("DROP TABLE IF EXISTS goal_history") 
-        cursor.execute("DROP TABLE IF EXISTS income_sources")
-        
+
+        # WAL persists on the database file; the other PRAGMAs are
+        # per-connection and are re-applied by the pool's factory
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-32000")
+        cursor.execute("PRAGMA foreign_keys=ON")
+
         # Income sources table (Ver.1 enhanced)
         cursor.execute("""
-            CREATE TABLE income_sources (
+            CREATE TABLE IF NOT EXISTS income_sources (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 type TEXT NOT NULL CHECK(type IN ('Fixed Unit', 'Daily Input', 'Passive')),
@@ -48,19 +219,19 @@ class IncomeTracker:
         
         # Goal history table (Ver.1 enhanced)
         cursor.execute("""
-            CREATE TABLE goal_history (
+            CREATE TABLE IF NOT EXISTS goal_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 income_id INTEGER,
                 old_goal_amount REAL,
                 new_goal_amount REAL,
                 changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (income_id) REFERENCES income_sources (id)
+                FOREIGN KEY (income_id) REFERENCES income_sources (id) ON DELETE CASCADE
             )
         """)
         
         # Daily task logs (Ver.1 enhanced)
         cursor.execute("""
-            CREATE TABLE daily_logs (
+            CREATE TABLE IF NOT EXISTS daily_logs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 income_id INTEGER,
                 task_name TEXT NOT NULL,
@@ -72,32 +243,45 @@ class IncomeTracker:
                 date TEXT NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (income_id) REFERENCES income_sources (id)
+                FOREIGN KEY (income_id) REFERENCES income_sources (id) ON DELETE CASCADE
             )
         """)
         
-        # Insert sample data to demonstrate the system
+        # Insert sample data to demonstrate the system, but only into a
+        # fresh database — never over user data
+        cursor.execute("SELECT COUNT(*) FROM income_sources")
+        if cursor.fetchone()[0] == 0:
+            cursor.executemany("""
+                INSERT INTO income_sources (name, type, goal_amount, unit_price, description)
+                VALUES (?, ?, ?, ?, ?)
+            """, SEED_ROWS)
+
+        # Covering index for the monthly per-source aggregations
         cursor.execute("""
-            INSERT INTO income_sources (name, type, goal_amount, unit_price, description)
-            VALUES 
-                ('FANZA出版', 'Fixed Unit', 30000, 100, 'デジタル出版による収入'),
-                ('フリーライティング', 'Fixed Unit', 50000, 5000, 'ライティング案件'),
-                ('Uber Eats', 'Daily Input', 25000, NULL, '配達による日次収入')
+            CREATE INDEX IF NOT EXISTS idx_logs_income_date
+            ON daily_logs(income_id, date)
         """)
-        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_logs_date
+            ON daily_logs(date)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_goal_hist_income
+            ON goal_history(income_id)
+        """)
+        # Covering index: the analytics SUM(amount) GROUP BY scans never
+        # need to touch the table itself
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_logs_income_date_amount
+            ON daily_logs(income_id, date, amount)
+        """)
+
         conn.commit()
         conn.close()
-    
-    def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(DATABASE_PATH)
-    
-    def dict_factory(self, cursor, row):
-        """Convert SQLite row to dictionary"""
-        d = {}
-        for idx, col in enumerate(cursor.description):
-            d[col[0]] = row[idx]
-        return d
+
+    def acquire(self):
+        """Check a pooled connection out for the duration of a request"""
+        return self.pool.acquire()
 
 # Initialize tracker
 tracker = IncomeTracker()
@@ -114,114 +298,144 @@ def serve_static(path):
     else:
         return send_from_directory('static', 'index.html')
 
+@app.after_request
+def cache_hashed_assets(response):
+    """Mark the content-hashed vite bundle files as immutable
+
+    Their filenames change on every rebuild, so browsers can cache them
+    for a year and never revalidate; repeat visits skip Flask entirely.
+    Ideally a CDN or nginx try_files serves them, but this covers the
+    single-process deployment too.
+    """
+    if request.path.startswith("/assets/"):
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
 @app.route("/api/income-sources", methods=["GET"])
 def get_income_sources():
     """Get all income sources"""
-    conn = tracker.get_connection()
-    conn.row_factory = tracker.dict_factory
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM income_sources ORDER BY created_at DESC")
-    sources = cursor.fetchall()
-    conn.close()
-    
-    return jsonify({"success": True, "data": sources})
+    with tracker.acquire() as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute(SQL_GET_SOURCES)
+        sources = cursor.fetchall()
+
+    return json_response({"success": True, "data": sources})
 
 @app.route("/api/income-sources", methods=["POST"])
 def create_income_source():
     """Create new income source (Ver.1 enhanced)"""
-    data = request.get_json()
-    
-    if not data.get("name") or not data.get("goal_amount") or not data.get("type"):
-        return jsonify({"success": False, "error": "Name, goal amount and type are required"}), 400
-    
+    try:
+        source = IncomeSourceIn.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify({"success": False, "error": _validation_message(e)}), 400
+
     # Validate type
-    if data["type"] not in ["Fixed Unit", "Daily Input", "Passive"]:
+    if source.type not in ["Fixed Unit", "Daily Input", "Passive"]:
         return jsonify({"success": False, "error": "Invalid income type"}), 400
-    
+
     # Validate unit_price for Fixed Unit type
-    if data["type"] == "Fixed Unit" and not data.get("unit_price"):
+    if source.type == "Fixed Unit" and not source.unit_price:
         return jsonify({"success": False, "error": "Unit price required for Fixed Unit type"}), 400
-    
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO income_sources (name, type, goal_amount, unit_price, description)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
-        data["name"],
-        data["type"],
-        float(data["goal_amount"]),
-        float(data.get("unit_price", 0)) if data.get("unit_price") else None,
-        data.get("description", "")
-    ))
-    
-    source_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
+
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO income_sources (name, type, goal_amount, unit_price, description)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            source.name,
+            source.type,
+            source.goal_amount,
+            source.unit_price or None,
+            source.description
+        ))
+
+        source_id = cursor.lastrowid
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True, "data": {"id": source_id}})
 
 @app.route("/api/income-sources/<int:source_id>", methods=["PUT"])
 def update_income_source(source_id):
     """Update income source (Ver.1 enhanced with goal history)"""
-    data = request.get_json()
-    
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    # Get current goal for history tracking
-    cursor.execute("SELECT goal_amount FROM income_sources WHERE id = ?", (source_id,))
-    current = cursor.fetchone()
-    
-    if not current:
-        conn.close()
-        return jsonify({"success": False, "error": "Income source not found"}), 404
-    
-    old_goal = current[0]
-    new_goal = float(data.get("goal_amount", old_goal))
-    
-    # Record goal change in history if changed
-    if old_goal != new_goal:
-        cursor.execute("""
-            INSERT INTO goal_history (income_id, old_goal_amount, new_goal_amount)
-            VALUES (?, ?, ?)
-        """, (source_id, old_goal, new_goal))
-    
-    # Update source
-    cursor.execute("""
-        UPDATE income_sources 
-        SET name = ?, type = ?, goal_amount = ?, unit_price = ?, description = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    """, (
-        data.get("name"),
-        data.get("type"),
-        new_goal,
-        float(data.get("unit_price", 0)) if data.get("unit_price") else None,
-        data.get("description", ""),
-        source_id
-    ))
-    
-    conn.commit()
-    conn.close()
-    
+    try:
+        source = IncomeSourceUpdate.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify({"success": False, "error": _validation_message(e)}), 400
+
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        # Get current goal for history tracking
+        cursor.execute("SELECT goal_amount FROM income_sources WHERE id = ?", (source_id,))
+        current = cursor.fetchone()
+
+        if not current:
+            return jsonify({"success": False, "error": "Income source not found"}), 404
+
+        old_goal = current[0]
+        new_goal = old_goal if source.goal_amount is None else source.goal_amount
+
+        # One explicit transaction for the history INSERT plus the
+        # UPDATE: a single fsync, and IMMEDIATE takes the write lock up
+        # front instead of risking SQLITE_BUSY at the second statement
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Record goal change in history if changed
+            if old_goal != new_goal:
+                cursor.execute("""
+                    INSERT INTO goal_history (income_id, old_goal_amount, new_goal_amount)
+                    VALUES (?, ?, ?)
+                """, (source_id, old_goal, new_goal))
+
+            # Update source
+            cursor.execute("""
+                UPDATE income_sources
+                SET name = ?, type = ?, goal_amount = ?, unit_price = ?, description = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (
+                source.name,
+                source.type,
+                new_goal,
+                source.unit_price or None,
+                source.description,
+                source_id
+            ))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True})
 
 @app.route("/api/income-sources/<int:source_id>", methods=["DELETE"])
 def delete_income_source(source_id):
     """Delete income source"""
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    # Delete related records
-    cursor.execute("DELETE FROM daily_logs WHERE source_id = ?", (source_id,))
-    cursor.execute("DELETE FROM goal_history WHERE source_id = ?", (source_id,))
-    cursor.execute("DELETE FROM income_sources WHERE id = ?", (source_id,))
-    
-    conn.commit()
-    conn.close()
-    
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        # Delete the children explicitly in one transaction: databases
+        # created before the CASCADE clauses were added still declare
+        # plain foreign keys, which foreign_keys=ON would otherwise
+        # turn into an IntegrityError on the parent delete
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute("DELETE FROM daily_logs WHERE income_id = ?", (source_id,))
+            cursor.execute("DELETE FROM goal_history WHERE income_id = ?", (source_id,))
+            cursor.execute("DELETE FROM income_sources WHERE id = ?", (source_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True})
 
 @app.route("/api/daily-logs", methods=["GET"])
@@ -230,163 +444,191 @@ def get_daily_logs():
     date_filter = request.args.get("date")
     source_id = request.args.get("source_id")
     
-    conn = tracker.get_connection()
-    conn.row_factory = tracker.dict_factory
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT dl.*, is.name as source_name 
-        FROM daily_logs dl
-        LEFT JOIN income_sources is ON dl.income_id = is.id
-        WHERE 1=1
-    """
+    query = SQL_GET_LOGS[(bool(date_filter), bool(source_id))]
     params = []
-    
+
     if date_filter:
-        query += " AND dl.date = ?"
         params.append(date_filter)
-    
+
     if source_id:
-        query += " AND dl.income_id = ?"
         params.append(int(source_id))
-    
-    query += " ORDER BY dl.date DESC, dl.created_at DESC"
-    
-    cursor.execute(query, params)
-    logs = cursor.fetchall()
-    conn.close()
-    
-    return jsonify({"success": True, "data": logs})
+
+    with tracker.acquire() as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        logs = cursor.fetchall()
+
+    return json_response({"success": True, "data": logs})
 
 @app.route("/api/daily-logs", methods=["POST"])
 def create_daily_log():
     """Create new daily task log (Ver.1 enhanced)"""
-    data = request.get_json()
-    
-    required_fields = ["income_id", "date", "task_name"]
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({"success": False, "error": f"{field} is required"}), 400
-    
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    # Get income type to calculate amount
-    cursor.execute("SELECT type, unit_price FROM income_sources WHERE id = ?", (int(data["income_id"]),))
-    income_info = cursor.fetchone()
-    
-    if not income_info:
-        conn.close()
-        return jsonify({"success": False, "error": "Income source not found"}), 404
-    
-    income_type, unit_price = income_info
-    calculated_amount = 0
-    
-    # Calculate amount based on income type
-    if income_type == "Fixed Unit" and unit_price and data.get("task_count"):
-        calculated_amount = unit_price * int(data["task_count"])
-    elif income_type in ["Daily Input", "Passive"] and data.get("amount"):
-        calculated_amount = float(data["amount"])
-    
-    cursor.execute("""
-        INSERT INTO daily_logs 
-        (income_id, date, task_name, task_count, amount, progress_percent, mood_score, note)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        int(data["income_id"]),
-        data["date"],
-        data["task_name"],
-        int(data.get("task_count", 0)) if data.get("task_count") else None,
-        calculated_amount,
-        int(data.get("progress_percent", 0)),
-        int(data.get("mood_score", 3)),
-        data.get("note", "")
-    ))
-    
-    log_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
+    try:
+        log = DailyLogIn.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify({"success": False, "error": _validation_message(e)}), 400
+
+    task_count = log.task_count or None
+    amount = log.amount or None
+
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        # INSERT ... SELECT computes the amount from the income type in
+        # the same statement; no row selected means no such source
+        cursor.execute(SQL_CREATE_DAILY_LOG, (
+            log.date,
+            log.task_name,
+            task_count,
+            task_count,
+            task_count,
+            amount,
+            log.progress_percent,
+            log.mood_score,
+            log.note,
+            log.income_id
+        ))
+
+        if cursor.rowcount == 0:
+            return jsonify({"success": False, "error": "Income source not found"}), 404
+
+        log_id = cursor.lastrowid
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True, "data": {"id": log_id}})
 
+@app.route("/api/daily-logs/bulk", methods=["POST"])
+def create_daily_logs_bulk():
+    """Create a batch of daily logs in a single transaction"""
+    data = request.get_json()
+
+    if not isinstance(data, list) or not data:
+        return jsonify({"success": False, "error": "Expected a non-empty array of logs"}), 400
+
+    try:
+        logs = [DailyLogIn.model_validate(item) for item in data]
+    except ValidationError as e:
+        return jsonify({"success": False, "error": _validation_message(e)}), 400
+
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        # Resolve income types once to calculate amounts for the batch
+        cursor.execute("SELECT id, type, unit_price FROM income_sources")
+        income_info = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        rows = []
+        for log in logs:
+            if log.income_id not in income_info:
+                return jsonify({"success": False, "error": "Income source not found"}), 404
+
+            income_type, unit_price = income_info[log.income_id]
+            calculated_amount = 0
+
+            # Calculate amount based on income type
+            if income_type == "Fixed Unit" and unit_price and log.task_count:
+                calculated_amount = unit_price * log.task_count
+            elif income_type in ["Daily Input", "Passive"] and log.amount:
+                calculated_amount = log.amount
+
+            rows.append((
+                log.income_id,
+                log.date,
+                log.task_name,
+                log.task_count or None,
+                calculated_amount,
+                log.progress_percent,
+                log.mood_score,
+                log.note
+            ))
+
+        # One explicit transaction for the whole batch: a single journal
+        # commit instead of one per row
+        conn.execute("BEGIN")
+        try:
+            cursor.executemany(SQL_INSERT_DAILY_LOG, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
+    return jsonify({"success": True, "data": {"created": len(rows)}})
+
 @app.route("/api/daily-logs/<int:log_id>", methods=["PUT"])
 def update_daily_log(log_id):
     """Update daily task log (Ver.1 enhanced)"""
-    data = request.get_json()
-    
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    # Get income type to calculate amount
-    cursor.execute("SELECT type, unit_price FROM income_sources WHERE id = ?", (int(data["income_id"]),))
-    income_info = cursor.fetchone()
-    
-    if not income_info:
-        conn.close()
-        return jsonify({"success": False, "error": "Income source not found"}), 404
-    
-    income_type, unit_price = income_info
-    calculated_amount = 0
-    
-    # Calculate amount based on income type
-    if income_type == "Fixed Unit" and unit_price and data.get("task_count"):
-        calculated_amount = unit_price * int(data["task_count"])
-    elif income_type in ["Daily Input", "Passive"] and data.get("amount"):
-        calculated_amount = float(data["amount"])
-    
-    cursor.execute("""
-        UPDATE daily_logs 
-        SET income_id = ?, date = ?, task_name = ?, task_count = ?, 
-            amount = ?, progress_percent = ?, mood_score = ?, note = ?,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    """, (
-        int(data["income_id"]),
-        data["date"],
-        data["task_name"],
-        int(data.get("task_count", 0)) if data.get("task_count") else None,
-        calculated_amount,
-        int(data.get("progress_percent", 0)),
-        int(data.get("mood_score", 3)),
-        data.get("note", ""),
-        log_id
-    ))
-    
-    conn.commit()
-    conn.close()
-    
+    try:
+        log = DailyLogIn.model_validate(request.get_json())
+    except ValidationError as e:
+        return jsonify({"success": False, "error": _validation_message(e)}), 400
+
+    task_count = log.task_count or None
+    amount = log.amount or None
+
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+
+        # The amount is recomputed by a correlated subquery against the
+        # income source; the EXISTS guard keeps the 404 semantics
+        cursor.execute(SQL_UPDATE_DAILY_LOG, (
+            log.income_id,
+            log.date,
+            log.task_name,
+            task_count,
+            task_count,
+            task_count,
+            amount,
+            log.income_id,
+            log.progress_percent,
+            log.mood_score,
+            log.note,
+            log_id,
+            log.income_id
+        ))
+
+        if cursor.rowcount == 0:
+            return jsonify({"success": False, "error": "Income source or log not found"}), 404
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True})
 
 @app.route("/api/daily-logs/<int:log_id>", methods=["DELETE"])
 def delete_daily_log(log_id):
     """Delete daily log"""
-    conn = tracker.get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("DELETE FROM daily_logs WHERE id = ?", (log_id,))
-    conn.commit()
-    conn.close()
-    
+    with tracker.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM daily_logs WHERE id = ?", (log_id,))
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE.clear()
     return jsonify({"success": True})
 
 @app.route("/api/dashboard", methods=["GET"])
 def get_dashboard_data():
     """Get comprehensive dashboard data (Ver.2 enhanced with visual feedback)"""
-    conn = tracker.get_connection()
-    conn.row_factory = tracker.dict_factory
-    cursor = conn.cursor()
-    
-    # Get current month's data
-    current_month = datetime.now().strftime("%Y-%m")
+    # Get current month's data; read the clock once and let calendar
+    # handle month lengths (the old modulo trick broke in December)
     today = datetime.now().date()
-    days_in_month = (datetime.now().replace(month=datetime.now().month % 12 + 1, day=1) - timedelta(days=1)).day
+    current_month = today.strftime("%Y-%m")
+    cache_key = ("dashboard", current_month)
+    with DASHBOARD_CACHE_LOCK:
+        cached = DASHBOARD_CACHE.get(cache_key)
+    if cached is not None:
+        return json_response({"success": True, "data": cached})
+
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
     current_day = today.day
     days_remaining = days_in_month - current_day
-    
-    # Get income sources with progress
-    cursor.execute("SELECT * FROM income_sources ORDER BY created_at DESC")
-    sources = cursor.fetchall()
-    
+
+    # Half-open month range so the date filter stays sargable
+    month_start = f"{current_month}-01"
+    next_month_start = (today.replace(day=28) + timedelta(days=4)).replace(day=1).strftime("%Y-%m-%d")
+
     dashboard_data = {
         "total_earned": 0,
         "total_goal": 0,
@@ -399,171 +641,169 @@ def get_dashboard_data():
         "recovery_plans": [],
         "global_summary": {}
     }
-    
-    for source in sources:
-        # Get current month's earnings for this source
-        cursor.execute("""
-            SELECT SUM(amount) as total_earned, COUNT(*) as task_count, AVG(mood_score) as avg_mood
-            FROM daily_logs 
-            WHERE income_id = ? AND date LIKE ?
-        """, (source["id"], f"{current_month}%"))
-        
-        earnings_data = cursor.fetchone()
-        earned = earnings_data["total_earned"] or 0
-        task_count = earnings_data["task_count"] or 0
-        avg_mood = earnings_data["avg_mood"] or 3
-        
-        progress_percent = (earned / source["goal_amount"] * 100) if source["goal_amount"] > 0 else 0
-        completion_rate = progress_percent / 100
-        
-        # Calculate required daily pace
-        remaining_amount = max(0, source["goal_amount"] - earned)
-        required_daily_pace = remaining_amount / max(1, days_remaining)
-        
-        # Determine alert level
-        expected_progress = (current_day / days_in_month * 100)
-        alert_level = "none"
-        if progress_percent < expected_progress - 20:
-            alert_level = "high"
-        elif progress_percent < expected_progress - 10:
-            alert_level = "medium"
-        elif progress_percent < expected_progress:
-            alert_level = "low"
-        
-        source_data = {
-            **source,
-            "earned_amount": earned,
-            "completion_rate": completion_rate,
-            "progress_percent": progress_percent,
-            "task_count": task_count,
-            "avg_mood": avg_mood,
-            "remaining_amount": remaining_amount,
-            "required_daily_pace": required_daily_pace,
-            "alert_level": alert_level,
-            "is_behind_target": progress_percent < expected_progress
-        }
-        
-        dashboard_data["sources"].append(source_data)
-        dashboard_data["total_earned"] += earned
-        dashboard_data["total_goal"] += source["goal_amount"]
-        
-        # Generate alerts for behind targets (Ver.3 shortfall detection)
-        if alert_level in ["medium", "high"]:
-            shortfall = remaining_amount
-            
-            # Calculate catch-up scenario
-            if source["type"] == "Fixed Unit" and source["unit_price"]:
-                current_daily_avg = earned / max(1, current_day)
-                required_multiplier = required_daily_pace / max(1, current_daily_avg)
-                catch_up_message = f"Do {required_multiplier:.1f}x more daily tasks for {days_remaining} days"
-            else:
-                catch_up_message = f"Earn ¥{required_daily_pace:.0f}/day for {days_remaining} days"
-            
-            # Calculate likelihood (basic simulation)
-            current_pace = earned / max(1, current_day)
-            likelihood = min(100, (current_pace * days_in_month / source["goal_amount"]) * 100)
-            
-            dashboard_data["recovery_plans"].append({
-                "income_name": source["name"],
-                "shortfall": shortfall,
-                "catch_up_message": catch_up_message,
-                "likelihood": likelihood,
-                "severity": alert_level
-            })
-    
+
+    with tracker.acquire() as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        # Income sources with this month's earnings aggregated in one
+        # GROUP BY instead of one SUM query per source
+        cursor.execute(SQL_DASHBOARD_SOURCES, (month_start, next_month_start))
+        sources = cursor.fetchall()
+
+        behind_count = 0
+        completion_sum = 0.0
+        pace_sum = 0.0
+
+        for row in sources:
+            source = dict(row)
+            earned = source.pop("earned")
+            task_count = source.pop("task_count")
+            avg_mood = source.pop("avg_mood")
+
+            progress_percent = (earned / source["goal_amount"] * 100) if source["goal_amount"] > 0 else 0
+            completion_rate = progress_percent / 100
+
+            # Calculate required daily pace
+            remaining_amount = max(0, source["goal_amount"] - earned)
+            required_daily_pace = remaining_amount / max(1, days_remaining)
+
+            # Determine alert level
+            expected_progress = (current_day / days_in_month * 100)
+            alert_level = "none"
+            if progress_percent < expected_progress - 20:
+                alert_level = "high"
+            elif progress_percent < expected_progress - 10:
+                alert_level = "medium"
+            elif progress_percent < expected_progress:
+                alert_level = "low"
+
+            source_data = {
+                **source,
+                "earned_amount": earned,
+                "completion_rate": completion_rate,
+                "progress_percent": progress_percent,
+                "task_count": task_count,
+                "avg_mood": avg_mood,
+                "remaining_amount": remaining_amount,
+                "required_daily_pace": required_daily_pace,
+                "alert_level": alert_level,
+                "is_behind_target": progress_percent < expected_progress
+            }
+
+            dashboard_data["sources"].append(source_data)
+            dashboard_data["total_earned"] += earned
+            dashboard_data["total_goal"] += source["goal_amount"]
+            behind_count += source_data["is_behind_target"]
+            completion_sum += completion_rate
+            pace_sum += required_daily_pace
+
+            # Generate alerts for behind targets (Ver.3 shortfall detection)
+            if alert_level in ["medium", "high"]:
+                shortfall = remaining_amount
+
+                # Calculate catch-up scenario
+                if source["type"] == "Fixed Unit" and source["unit_price"]:
+                    current_daily_avg = earned / max(1, current_day)
+                    required_multiplier = required_daily_pace / max(1, current_daily_avg)
+                    catch_up_message = f"Do {required_multiplier:.1f}x more daily tasks for {days_remaining} days"
+                else:
+                    catch_up_message = f"Earn ¥{required_daily_pace:.0f}/day for {days_remaining} days"
+
+                # Calculate likelihood (basic simulation)
+                current_pace = earned / max(1, current_day)
+                likelihood = min(100, (current_pace * days_in_month / source["goal_amount"]) * 100)
+
+                dashboard_data["recovery_plans"].append({
+                    "income_name": source["name"],
+                    "shortfall": shortfall,
+                    "catch_up_message": catch_up_message,
+                    "likelihood": likelihood,
+                    "severity": alert_level
+                })
+
     # Global summary calculations
     dashboard_data["overall_progress"] = (dashboard_data["total_earned"] / dashboard_data["total_goal"] * 100) if dashboard_data["total_goal"] > 0 else 0
-    
+
     dashboard_data["global_summary"] = {
-        "total_behind_target": len([s for s in dashboard_data["sources"] if s["is_behind_target"]]),
-        "avg_completion_rate": sum([s["completion_rate"] for s in dashboard_data["sources"]]) / len(dashboard_data["sources"]) if dashboard_data["sources"] else 0,
-        "total_required_daily": sum([s["required_daily_pace"] for s in dashboard_data["sources"]])
+        "total_behind_target": behind_count,
+        "avg_completion_rate": completion_sum / len(dashboard_data["sources"]) if dashboard_data["sources"] else 0,
+        "total_required_daily": pace_sum
     }
-    
-    conn.close()
-    return jsonify({"success": True, "data": dashboard_data})
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE[cache_key] = dashboard_data
+    return json_response({"success": True, "data": dashboard_data})
 
 @app.route("/api/analytics", methods=["GET"])
 def get_analytics():
     """Get analytics data for charts (Ver.2 enhanced graphs)"""
     period = request.args.get("period", "week")
-    
-    conn = tracker.get_connection()
-    conn.row_factory = tracker.dict_factory
-    cursor = conn.cursor()
-    
-    analytics = {}
-    
-    if period == "week":
-        # Last 7 days daily income trend
+
+    cache_key = ("analytics", period)
+    with DASHBOARD_CACHE_LOCK:
+        cached = DASHBOARD_CACHE.get(cache_key)
+    if cached is not None:
+        return json_response({"success": True, "data": cached})
+
+    with tracker.acquire() as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.arraysize = 256
+
+        # Daily income trend: one 30-day scan covers both periods; the
+        # 7-day view is a suffix of the same series, sliced below
         cursor.execute("""
             SELECT date, SUM(amount) as daily_total, COUNT(*) as task_count
-            FROM daily_logs 
-            WHERE date >= date('now', '-7 days')
+            FROM daily_logs
+            WHERE date >= date('now', '-30 days')
             GROUP BY date
             ORDER BY date
         """)
-        daily_data = cursor.fetchall()
-        
-        # Weekly task volume by income source
-        cursor.execute("""
-            SELECT is.name, SUM(dl.task_count) as total_tasks, SUM(dl.amount) as total_amount
+        daily_data = [dict(row) for row in _iter_rows(cursor)]
+        if period == "week":
+            # Same UTC 'now' notion as SQLite's date()
+            week_floor = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
+            daily_data = [d for d in daily_data if d["date"] >= week_floor]
+
+        # Task volume by income source over the selected period
+        horizon = "-7 days" if period == "week" else "-30 days"
+        cursor.execute(f"""
+            SELECT src.name, SUM(dl.task_count) as total_tasks, SUM(dl.amount) as total_amount
             FROM daily_logs dl
-            JOIN income_sources is ON dl.income_id = is.id
-            WHERE dl.date >= date('now', '-7 days')
-            GROUP BY is.name
+            JOIN income_sources src ON dl.income_id = src.id
+            WHERE dl.date >= date('now', '{horizon}')
+            GROUP BY src.name
             ORDER BY total_amount DESC
         """)
-        weekly_volume = cursor.fetchall()
-        
-    elif period == "month":
-        # Last 30 days
+        weekly_volume = [dict(row) for row in _iter_rows(cursor)]
+
+        # Mood vs Productivity correlation (always calculated)
         cursor.execute("""
-            SELECT date, SUM(amount) as daily_total, COUNT(*) as task_count
-            FROM daily_logs 
-            WHERE date >= date('now', '-30 days')
-            GROUP BY date
-            ORDER BY date
+            SELECT mood_score, AVG(amount) as avg_earnings, COUNT(*) as count
+            FROM daily_logs
+            WHERE date >= date('now', '-30 days') AND amount > 0
+            GROUP BY mood_score
+            ORDER BY mood_score
         """)
-        daily_data = cursor.fetchall()
-        
-        # Monthly task volume
+        mood_performance = [dict(row) for row in _iter_rows(cursor)]
+
+        # Income source performance comparison
         cursor.execute("""
-            SELECT is.name, SUM(dl.task_count) as total_tasks, SUM(dl.amount) as total_amount
-            FROM daily_logs dl
-            JOIN income_sources is ON dl.income_id = is.id
-            WHERE dl.date >= date('now', '-30 days')
-            GROUP BY is.name
-            ORDER BY total_amount DESC
+            SELECT
+                src.name,
+                src.goal_amount,
+                COALESCE(SUM(dl.amount), 0) as earned,
+                COUNT(dl.id) as task_days,
+                AVG(dl.mood_score) as avg_mood
+            FROM income_sources src
+            LEFT JOIN daily_logs dl ON src.id = dl.income_id
+                AND dl.date >= date('now', 'start of month')
+            GROUP BY src.id, src.name, src.goal_amount
+            ORDER BY earned DESC
         """)
-        weekly_volume = cursor.fetchall()
-    
-    # Mood vs Productivity correlation (always calculated)
-    cursor.execute("""
-        SELECT mood_score, AVG(amount) as avg_earnings, COUNT(*) as count
-        FROM daily_logs 
-        WHERE date >= date('now', '-30 days') AND amount > 0
-        GROUP BY mood_score
-        ORDER BY mood_score
-    """)
-    mood_performance = cursor.fetchall()
-    
-    # Income source performance comparison
-    cursor.execute("""
-        SELECT 
-            is.name,
-            is.goal_amount,
-            COALESCE(SUM(dl.amount), 0) as earned,
-            COUNT(dl.id) as task_days,
-            AVG(dl.mood_score) as avg_mood
-        FROM income_sources is
-        LEFT JOIN daily_logs dl ON is.id = dl.income_id 
-            AND dl.date >= date('now', 'start of month')
-        GROUP BY is.id, is.name, is.goal_amount
-        ORDER BY earned DESC
-    """)
-    income_performance = cursor.fetchall()
-    
+        income_performance = [dict(row) for row in _iter_rows(cursor)]
+
     analytics = {
         "daily_income_trend": daily_data,
         "mood_productivity_correlation": mood_performance,
@@ -571,9 +811,11 @@ def get_analytics():
         "income_performance": income_performance,
         "period": period
     }
-    
-    conn.close()
-    return jsonify({"success": True, "data": analytics})
+
+    with DASHBOARD_CACHE_LOCK:
+        DASHBOARD_CACHE[cache_key] = analytics
+    return json_response({"success": True, "data": analytics})
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # Development fallback only; production runs gunicorn against wsgi:app
+    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -1,30 +1,60 @@
 import json
 import csv
 import os
+import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import calendar
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class IncomeGoalManager:
     def __init__(self):
         self.income_sources_file = "income_sources.json"
         self.daily_logs_file = "daily_logs.csv"
+        self.db_file = "daily_logs.db"
         self.settings_file = "app_settings.json"
+        self._conn = None
+        self._json_cache = {}
+        self._monthly_cache = None
         self.init_files()
     
     def init_files(self):
         """Initialize all data files if they don't exist"""
         # Income sources file
         if not os.path.exists(self.income_sources_file):
-            default_sources = []
-            with open(self.income_sources_file, "w", encoding="utf-8") as f:
-                json.dump(default_sources, f, ensure_ascii=False, indent=2)
+            self._write_json(self.income_sources_file, [])
         
-        # Daily logs CSV
-        if not os.path.exists(self.daily_logs_file):
-            with open(self.daily_logs_file, "w", encoding="utf-8", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["id", "date", "source_id", "task_description", "units_completed", "progress_percent", "mood_score", "skip_reason", "created_at"])
+        # Daily logs database; appends, date lookups and monthly sums all
+        # go through SQLite instead of rescanning a CSV
+        self._conn = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                source_id INTEGER,
+                task_description TEXT,
+                units_completed INTEGER DEFAULT 0,
+                progress_percent INTEGER DEFAULT 0,
+                mood_score INTEGER DEFAULT 3,
+                skip_reason TEXT DEFAULT '',
+                created_at TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_date ON daily_logs(date)")
+        # Covering index in GROUP BY order: the monthly SUM/AVG aggregate
+        # reads this index alone, already grouped, never touching table rows
+        self._conn.execute("DROP INDEX IF EXISTS idx_logs_source")
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_logs_source_stats
+            ON daily_logs(source_id, date, units_completed, mood_score)
+        """)
+        self._migrate_csv_logs()
         
         # Settings file
         if not os.path.exists(self.settings_file):
@@ -33,17 +63,47 @@ class IncomeGoalManager:
                 "currency": "yen",
                 "created_at": datetime.now().isoformat()
             }
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(default_settings, f, ensure_ascii=False, indent=2)
+            self._write_json(self.settings_file, default_settings)
     
-    def get_income_sources(self) -> List[Dict[str, Any]]:
-        """Get all income sources"""
+    def _load_json(self, path: str, default):
+        """Load a JSON file, reusing the parsed object until the file changes"""
         try:
-            with open(self.income_sources_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            st = os.stat(path)
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._json_cache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            self._json_cache[path] = (key, data)
+            return data
         except Exception as e:
-            print(f"Error reading income sources: {e}")
-            return []
+            print(f"Error reading {path}: {e}")
+            return default
+    
+    def _write_json(self, path: str, data):
+        """Atomically rewrite a JSON file (compact form) and refresh the cache
+
+        Writing to a temp file and os.replace-ing keeps a crash from
+        truncating the target; dropping indent=2 shrinks the bytes written.
+        """
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(data))
+            else:
+                f.write(json.dumps(
+                    data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.replace(tmp, path)
+        
+        st = os.stat(path)
+        self._json_cache[path] = ((st.st_mtime_ns, st.st_size), data)
+    
+    def get_income_sources(self) -> List[Dict[str, Any]]:
+        """Get all income sources"""
+        return self._load_json(self.income_sources_file, [])
     
     def add_income_source(self, name: str, unit_price: int, monthly_target: int, description: str = "") -> bool:
         """Add a new income source"""
@@ -62,8 +122,7 @@ class IncomeGoalManager:
             
             sources.append(new_source)
             
-            with open(self.income_sources_file, "w", encoding="utf-8") as f:
-                json.dump(sources, f, ensure_ascii=False, indent=2)
+            self._write_json(self.income_sources_file, sources)
             
             return True
         except Exception as e:
@@ -80,8 +139,7 @@ class IncomeGoalManager:
                     source['updated_at'] = datetime.now().isoformat()
                     break
             
-            with open(self.income_sources_file, "w", encoding="utf-8") as f:
-                json.dump(sources, f, ensure_ascii=False, indent=2)
+            self._write_json(self.income_sources_file, sources)
             
             return True
         except Exception as e:
@@ -94,88 +152,121 @@ class IncomeGoalManager:
             sources = self.get_income_sources()
             sources = [s for s in sources if s['id'] != source_id]
             
-            with open(self.income_sources_file, "w", encoding="utf-8") as f:
-                json.dump(sources, f, ensure_ascii=False, indent=2)
+            self._write_json(self.income_sources_file, sources)
             
             return True
         except Exception as e:
             print(f"Error deleting income source: {e}")
             return False
     
+    def _migrate_csv_logs(self):
+        """One-shot import of the legacy daily_logs.csv into SQLite"""
+        if not os.path.exists(self.daily_logs_file):
+            return
+        if self._conn.execute("SELECT COUNT(*) FROM daily_logs").fetchone()[0]:
+            return
+        
+        try:
+            with open(self.daily_logs_file, "r", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                rows = [
+                    (int(row['id']), row['date'], int(row['source_id']),
+                     row['task_description'], int(row['units_completed']),
+                     int(row['progress_percent']), int(row['mood_score']),
+                     row['skip_reason'], row['created_at'])
+                    for row in reader
+                ]
+            
+            if rows:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("""
+                    INSERT INTO daily_logs
+                    (id, date, source_id, task_description, units_completed, progress_percent, mood_score, skip_reason, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.execute("COMMIT")
+        except Exception as e:
+            # Don't leave the explicit BEGIN open on this autocommit
+            # connection, or every later INSERT joins a transaction
+            # that never commits
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            print(f"Error migrating daily logs: {e}")
+    
     def add_daily_log(self, source_id: int, task_description: str, units_completed: int, 
                      progress_percent: int, mood_score: int, skip_reason: str = "") -> bool:
         """Add a daily task log"""
         try:
-            log_id = self.get_next_log_id()
-            today = datetime.now().strftime("%Y-%m-%d")
-            created_at = datetime.now().isoformat()
+            now = datetime.now()
+            today = now.strftime("%Y-%m-%d")
+            created_at = now.isoformat()
             
-            with open(self.daily_logs_file, "a", encoding="utf-8", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([log_id, today, source_id, task_description, units_completed, 
-                               progress_percent, mood_score, skip_reason, created_at])
+            self._conn.execute("""
+                INSERT INTO daily_logs
+                (date, source_id, task_description, units_completed, progress_percent, mood_score, skip_reason, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (today, source_id, task_description, units_completed,
+                  progress_percent, mood_score, skip_reason, created_at))
             
             return True
         except Exception as e:
             print(f"Error adding daily log: {e}")
             return False
     
-    def get_next_log_id(self) -> int:
-        """Get the next available log ID"""
-        try:
-            with open(self.daily_logs_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                max_id = 0
-                for row in reader:
-                    try:
-                        current_id = int(row['id'])
-                        max_id = max(max_id, current_id)
-                    except (ValueError, KeyError):
-                        continue
-                return max_id + 1
-        except Exception:
-            return 1
-    
     def get_daily_logs(self, date_str: str = None) -> List[Dict[str, Any]]:
         """Get daily logs for a specific date or all logs"""
-        logs = []
-        if not os.path.exists(self.daily_logs_file):
-            return logs
-        
         try:
-            with open(self.daily_logs_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if date_str is None or row['date'] == date_str:
-                        log = {
-                            'id': int(row['id']),
-                            'date': row['date'],
-                            'source_id': int(row['source_id']),
-                            'task_description': row['task_description'],
-                            'units_completed': int(row['units_completed']),
-                            'progress_percent': int(row['progress_percent']),
-                            'mood_score': int(row['mood_score']),
-                            'skip_reason': row['skip_reason'],
-                            'created_at': row['created_at']
-                        }
-                        logs.append(log)
+            if date_str is None:
+                cursor = self._conn.execute("SELECT * FROM daily_logs ORDER BY id")
+            else:
+                cursor = self._conn.execute(
+                    "SELECT * FROM daily_logs WHERE date = ? ORDER BY id", (date_str,))
+            
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
         except Exception as e:
             print(f"Error reading daily logs: {e}")
-        
-        return logs
+            return []
     
     def get_monthly_progress(self) -> Dict[str, Any]:
         """Calculate monthly progress and income"""
         today = datetime.now()
-        month_start = today.replace(day=1)
         
-        # Get current month logs
-        logs = self.get_daily_logs()
-        monthly_logs = [log for log in logs if log['date'] >= month_start.strftime("%Y-%m-%d")]
+        # Reuse the last result until a log is written, a JSON file
+        # changes, or the day rolls over. The logs component is derived
+        # from the table itself so that writes by other gunicorn workers
+        # invalidate this process's memo too.
+        try:
+            sources_key = os.stat(self.income_sources_file).st_mtime_ns
+            settings_key = os.stat(self.settings_file).st_mtime_ns
+        except OSError:
+            sources_key = settings_key = None
+        try:
+            logs_key = self._conn.execute(
+                "SELECT COUNT(*), MAX(id) FROM daily_logs").fetchone()
+        except Exception:
+            logs_key = None
+        today_str = today.strftime("%Y-%m-%d")
+        cache_key = (sources_key, settings_key, logs_key, today_str)
+        if self._monthly_cache is not None and self._monthly_cache[0] == cache_key:
+            return self._monthly_cache[1]
+        
+        month_start_str = today_str[:8] + "01"
+        
+        # This month's units and mood per source, aggregated by SQLite
+        # over the date index instead of filtering every log in Python
+        stats_by_source = {}
+        try:
+            cursor = self._conn.execute("""
+                SELECT source_id, SUM(units_completed), AVG(mood_score)
+                FROM daily_logs WHERE date >= ? GROUP BY source_id
+            """, (month_start_str,))
+            stats_by_source = {sid: (units, avg_mood) for sid, units, avg_mood in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error aggregating monthly logs: {e}")
         
         # Get income sources
         sources = self.get_income_sources()
-        source_dict = {s['id']: s for s in sources}
         
         # Calculate progress by source
         source_progress = {}
@@ -183,9 +274,7 @@ class IncomeGoalManager:
         
         for source in sources:
             source_id = source['id']
-            source_logs = [log for log in monthly_logs if log['source_id'] == source_id]
-            
-            units_completed = sum(log['units_completed'] for log in source_logs)
+            units_completed, avg_mood = stats_by_source.get(source_id, (0, None))
             income_earned = units_completed * source['unit_price']
             target_income = source['monthly_target'] * source['unit_price']
             
@@ -196,7 +285,8 @@ class IncomeGoalManager:
                 'units_remaining': max(0, source['monthly_target'] - units_completed),
                 'income_earned': income_earned,
                 'target_income': target_income,
-                'completion_rate': (units_completed / source['monthly_target'] * 100) if source['monthly_target'] > 0 else 0
+                'completion_rate': (units_completed / source['monthly_target'] * 100) if source['monthly_target'] > 0 else 0,
+                'avg_mood': avg_mood if avg_mood is not None else 3
             }
             
             total_income += income_earned
@@ -209,7 +299,7 @@ class IncomeGoalManager:
         overall_progress = (total_income / monthly_goal * 100) if monthly_goal > 0 else 0
         missed_income = max(0, monthly_goal - total_income)
         
-        return {
+        progress = {
             'total_income': total_income,
             'monthly_goal': monthly_goal,
             'overall_progress': overall_progress,
@@ -218,15 +308,13 @@ class IncomeGoalManager:
             'days_in_month': calendar.monthrange(today.year, today.month)[1],
             'current_day': today.day
         }
+        self._monthly_cache = (cache_key, progress)
+        return progress
     
     def get_settings(self) -> Dict[str, Any]:
         """Get application settings"""
-        try:
-            with open(self.settings_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error reading settings: {e}")
-            return {"monthly_income_goal": 70000, "currency": "yen"}
+        return self._load_json(
+            self.settings_file, {"monthly_income_goal": 70000, "currency": "yen"})
     
     def update_settings(self, new_settings: Dict[str, Any]) -> bool:
         """Update application settings"""
@@ -235,8 +323,7 @@ class IncomeGoalManager:
             current_settings.update(new_settings)
             current_settings['updated_at'] = datetime.now().isoformat()
             
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(current_settings, f, ensure_ascii=False, indent=2)
+            self._write_json(self.settings_file, current_settings)
             
             return True
         except Exception as e:
@@ -270,9 +357,17 @@ class IncomeGoalManager:
         if progress['overall_progress'] < 70:
             suggestions.append(f"目標達成まで{progress['missed_income']:,}円不足しています。優先タスクに集中しましょう。")
         
-        # Get recent mood data
-        recent_logs = self.get_daily_logs(today.strftime("%Y-%m-%d"))
-        avg_mood = sum(log['mood_score'] for log in recent_logs) / len(recent_logs) if recent_logs else 3
+        # Get recent mood data; AVG over the date index beats fetching
+        # today's rows just to average one column in Python
+        avg_mood = 3
+        try:
+            row = self._conn.execute(
+                "SELECT AVG(mood_score) FROM daily_logs WHERE date = ?",
+                (today.strftime("%Y-%m-%d"),)).fetchone()
+            if row[0] is not None:
+                avg_mood = row[0]
+        except Exception as e:
+            print(f"Error reading today's mood: {e}")
         
         if avg_mood < 3:
             suggestions.append("気分が低めです。小さなタスクから始めて勢いをつけましょう。")
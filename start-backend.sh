@@ -0,0 +1,2 @@
+#!/bin/bash
+gunicorn -w "$(nproc)" -k gthread --threads 4 -b 0.0.0.0:5000 app:app
@@ -0,0 +1,8 @@
+"""Gunicorn entry point for the income tracker API
+
+Run with: gunicorn -w 2 --threads 8 --worker-class gthread wsgi:app
+
+Threaded workers let WAL-mode reads overlap; keep the connection pool
+size at or above the thread count.
+"""
+from main import app  # noqa: F401